@@ -1,4 +1,4 @@
-import random
+import math
 import warnings
 from typing import Union
 
@@ -8,26 +8,43 @@ from numpy.typing import NDArray
 from audiomentations.core.transforms_interface import BaseWaveformTransform
 from audiomentations.core.utils import convert_decibels_to_amplitude_ratio
 
+# Multiplying a gain in dB by this gives the natural logarithm of its amplitude ratio
+_DB_TO_AMP_K = np.float32(math.log(10.0) / 20.0)
+
+_DURATION_UNIT_SAMPLES = 0
+_DURATION_UNIT_FRACTION = 1
+_DURATION_UNIT_SECONDS = 2
+_DURATION_UNIT_IDS = {
+    "samples": _DURATION_UNIT_SAMPLES,
+    "fraction": _DURATION_UNIT_FRACTION,
+    "seconds": _DURATION_UNIT_SECONDS,
+}
+
 
 def get_fade_mask(
     start_level_db: float,
     end_level_db: float,
     fade_time_samples: int,
+    dtype: np.dtype = np.float32,
 ):
     """
     :param start_level_db:
     :param end_level_db:
     :param fade_time_samples: How long does the fade last?
+    :param dtype: The dtype of the returned mask. The mask is computed in float32
+        and then converted, so the exp does not lose precision in e.g. float16.
     :return:
     """
+    # Build the ramp in ln(amplitude) and apply exp in place, so the whole mask is
+    # computed in a single float32 buffer
     fade_mask = np.linspace(
-        start_level_db,
-        end_level_db,
+        start_level_db * _DB_TO_AMP_K,
+        end_level_db * _DB_TO_AMP_K,
         num=fade_time_samples,
         dtype=np.float32,
     )
-    fade_mask = convert_decibels_to_amplitude_ratio(fade_mask)
-    return fade_mask
+    np.exp(fade_mask, out=fade_mask)
+    return fade_mask.astype(dtype, copy=False)
 
 
 class GainTransition(BaseWaveformTransform):
@@ -112,71 +129,139 @@ class GainTransition(BaseWaveformTransform):
         assert min_duration <= max_duration
         self.min_duration = min_duration
         self.max_duration = max_duration
+        if duration_unit not in _DURATION_UNIT_IDS:
+            raise ValueError(
+                'duration_unit must be "fraction", "samples" or "seconds", got'
+                " {!r}".format(duration_unit)
+            )
         self.duration_unit = duration_unit
+        self._duration_unit_id = _DURATION_UNIT_IDS[duration_unit]
+        # A ((start_level_db, end_level_db, fade_time_samples, dtype), fade_mask) tuple
+        # holding the most recently computed fade mask. Applying the transform
+        # repeatedly with the same (e.g. frozen) parameters can then reuse it. Key and
+        # mask are stored together, so threads sharing the transform never see a
+        # mask that doesn't match its key.
+        self._cached_fade_mask = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # The cached fade mask can be large, and is cheap to recompute
+        state["_cached_fade_mask"] = None
+        return state
 
     def randomize_parameters(self, samples: NDArray[np.float32], sample_rate: int):
         super().randomize_parameters(samples, sample_rate)
         if self.parameters["should_apply"]:
-            if self.duration_unit == "samples":
-                min_duration_in_samples = self.min_duration
-                max_duration_in_samples = self.max_duration
-            elif self.duration_unit == "fraction":
+            duration_unit_id = self._duration_unit_id
+            if duration_unit_id == _DURATION_UNIT_SECONDS:
+                min_duration_in_samples = int(round(self.min_duration * sample_rate))
+                max_duration_in_samples = int(round(self.max_duration * sample_rate))
+            elif duration_unit_id == _DURATION_UNIT_SAMPLES:
+                min_duration_in_samples = int(self.min_duration)
+                max_duration_in_samples = int(self.max_duration)
+            else:
                 min_duration_in_samples = int(
                     round(self.min_duration * samples.shape[-1])
                 )
                 max_duration_in_samples = int(
                     round(self.max_duration * samples.shape[-1])
                 )
-            elif self.duration_unit == "seconds":
-                min_duration_in_samples = int(round(self.min_duration * sample_rate))
-                max_duration_in_samples = int(round(self.max_duration * sample_rate))
-            else:
-                raise ValueError("Invalid duration_unit")
 
+            # Draw all four random numbers in one call, and map them to the parameters.
+            # Convert them to Python floats first, as scalar math on those is faster
+            # than on numpy scalars.
+            u0, u1, u2, u3 = np.random.random(4).tolist()
             self.parameters["fade_time_samples"] = max(
-                3, random.randint(min_duration_in_samples, max_duration_in_samples)
-            )
-            self.parameters["t0"] = random.randint(
-                -self.parameters["fade_time_samples"] + 2,
-                samples.shape[-1] - 2,
-            )
-            self.parameters["start_gain_db"] = random.uniform(
-                self.min_gain_db, self.max_gain_db
-            )
-            self.parameters["end_gain_db"] = random.uniform(
-                self.min_gain_db, self.max_gain_db
+                3,
+                min_duration_in_samples
+                + int(u0 * (max_duration_in_samples - min_duration_in_samples + 1)),
             )
+            min_t0 = -self.parameters["fade_time_samples"] + 2
+            max_t0 = samples.shape[-1] - 2
+            self.parameters["t0"] = min_t0 + int(u1 * (max_t0 - min_t0 + 1))
+            gain_range_db = self.max_gain_db - self.min_gain_db
+            self.parameters["start_gain_db"] = self.min_gain_db + gain_range_db * u2
+            self.parameters["end_gain_db"] = self.min_gain_db + gain_range_db * u3
+
+    def _get_fade_mask(
+        self,
+        start_level_db: float,
+        end_level_db: float,
+        fade_time_samples: int,
+        dtype: np.dtype,
+    ) -> NDArray:
+        key = (start_level_db, end_level_db, fade_time_samples, dtype)
+        cached_fade_mask = self._cached_fade_mask
+        if cached_fade_mask is not None and cached_fade_mask[0] == key:
+            return cached_fade_mask[1]
+
+        fade_mask = get_fade_mask(
+            start_level_db, end_level_db, fade_time_samples, dtype
+        )
+        # The cached mask is shared between calls, so guard it against mutation
+        fade_mask.setflags(write=False)
+        self._cached_fade_mask = (key, fade_mask)
+        return fade_mask
 
     def apply(self, samples: NDArray[np.float32], sample_rate: int):
+        start_gain_db = self.parameters["start_gain_db"]
+        end_gain_db = self.parameters["end_gain_db"]
+        if abs(start_gain_db) < 1e-6 and abs(end_gain_db) < 1e-6:
+            # The gain is 0 dB all the way, so the sound is unchanged
+            return samples
+
+        # Multichannel samples are expected to have shape (num_channels, num_samples).
+        # Make sure the time axis is contiguous in memory, so the per-region
+        # multiplications below run over contiguous rows, even if a transposed
+        # array was passed in.
+        samples = np.ascontiguousarray(samples)
         num_samples = samples.shape[-1]
-        fade_mask = get_fade_mask(
-            start_level_db=self.parameters["start_gain_db"],
-            end_level_db=self.parameters["end_gain_db"],
-            fade_time_samples=self.parameters["fade_time_samples"],
+
+        # Convert the constant gains once, and cast them to the dtype of the samples,
+        # so the multiplications below never upcast (e.g. float32 samples to float64)
+        start_amplitude_ratio = samples.dtype.type(
+            convert_decibels_to_amplitude_ratio(start_gain_db)
         )
-        start_sample_index = self.parameters["t0"]
-        end_sample_index = start_sample_index + self.parameters["fade_time_samples"]
-        if start_sample_index < 0:
-            # crop fade_mask: shave off a chunk in the beginning
-            num_samples_to_shave_off = abs(start_sample_index)
-            fade_mask = fade_mask[num_samples_to_shave_off:]
-            start_sample_index = 0
-
-        if end_sample_index > num_samples:
-            # crop fade_mask: shave off a chunk in the end
-            num_samples_to_shave_off = end_sample_index - num_samples
-            fade_mask = fade_mask[: fade_mask.shape[-1] - num_samples_to_shave_off]
-            end_sample_index = num_samples
-
-        samples = np.copy(samples)
-
-        samples[..., start_sample_index:end_sample_index] *= fade_mask
-        if start_sample_index > 0:
-            samples[..., :start_sample_index] *= convert_decibels_to_amplitude_ratio(
-                self.parameters["start_gain_db"]
-            )
-        if end_sample_index < num_samples:
-            samples[..., end_sample_index:] *= convert_decibels_to_amplitude_ratio(
-                self.parameters["end_gain_db"]
-            )
-        return samples
+        end_amplitude_ratio = samples.dtype.type(
+            convert_decibels_to_amplitude_ratio(end_gain_db)
+        )
+        if start_gain_db == end_gain_db:
+            # There is no transition, just a constant gain
+            return np.multiply(samples, start_amplitude_ratio)
+
+        fade_time_samples = self.parameters["fade_time_samples"]
+        t0 = self.parameters["t0"]
+
+        # The transition may start before and/or end after the audio. Find the part of
+        # it that overlaps the audio, and compute the fade mask only for that part.
+        first_visible_fade_index = max(0, -t0)
+        last_visible_fade_index = min(fade_time_samples, num_samples - t0) - 1
+        db_per_sample = (end_gain_db - start_gain_db) / (fade_time_samples - 1)
+        fade_mask = self._get_fade_mask(
+            start_level_db=start_gain_db + db_per_sample * first_visible_fade_index,
+            end_level_db=start_gain_db + db_per_sample * last_visible_fade_index,
+            fade_time_samples=last_visible_fade_index - first_visible_fade_index + 1,
+            dtype=samples.dtype,
+        )
+        start_sample_index = t0 + first_visible_fade_index
+        end_sample_index = t0 + last_visible_fade_index + 1
+
+        # Write each region straight into the output buffer, so every input sample
+        # is read once and written once
+        processed_samples = np.empty_like(samples)
+        np.multiply(
+            samples[..., start_sample_index:end_sample_index],
+            fade_mask,
+            out=processed_samples[..., start_sample_index:end_sample_index],
+        )
+        np.multiply(
+            samples[..., :start_sample_index],
+            start_amplitude_ratio,
+            out=processed_samples[..., :start_sample_index],
+        )
+        np.multiply(
+            samples[..., end_sample_index:],
+            end_amplitude_ratio,
+            out=processed_samples[..., end_sample_index:],
+        )
+        return processed_samples
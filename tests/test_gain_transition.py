@@ -1,3 +1,4 @@
+import pickle
 import random
 
 import numpy as np
@@ -54,14 +55,169 @@ class TestGainTransition:
         assert processed_samples.shape == samples.shape
         assert processed_samples.dtype == np.float32
 
+    @pytest.mark.parametrize(
+        "t0, fade_time_samples",
+        [
+            (-50, 300),  # transition starts before the sound and ends after it
+            (0, 200),  # no constant-gain head, transition ends exactly at the end
+            (-20, 120),  # starts before the sound, constant-gain tail
+            (40, 500),  # constant-gain head, ends after the sound
+        ],
+    )
+    def test_head_fade_and_tail_regions(self, t0, fade_time_samples):
+        samples = np.ones((2, 200), dtype=np.float32)
+        augment = GainTransition(min_gain_db=-12.0, max_gain_db=6.0, p=1.0)
+        augment.parameters = {
+            "should_apply": True,
+            "fade_time_samples": fade_time_samples,
+            "t0": t0,
+            "start_gain_db": -12.0,
+            "end_gain_db": 6.0,
+        }
+        augment.freeze_parameters()
+        processed_samples = augment(samples=samples, sample_rate=16000)
+
+        gains_db = np.interp(
+            np.arange(200),
+            [t0, t0 + fade_time_samples - 1],
+            [-12.0, 6.0],
+        )
+        expected_samples = np.tile(10 ** (gains_db / 20), (2, 1))
+        assert processed_samples.dtype == np.float32
+        np.testing.assert_allclose(processed_samples, expected_samples, rtol=1e-5)
+
+    @pytest.mark.parametrize(
+        "start_gain_db, end_gain_db",
+        [(-12.0, 6.0), (-60.0, 20.0), (20.0, -60.0)],
+    )
+    def test_float16(self, start_gain_db, end_gain_db):
+        np.random.seed(7)
+        samples = np.random.uniform(low=-0.5, high=0.5, size=(2, 2000)).astype(
+            np.float16
+        )
+        augment = GainTransition(p=1.0)
+        augment.parameters = {
+            "should_apply": True,
+            "fade_time_samples": 1500,
+            "t0": 200,
+            "start_gain_db": start_gain_db,
+            "end_gain_db": end_gain_db,
+        }
+        augment.freeze_parameters()
+        processed_samples = augment(samples=samples, sample_rate=16000)
+        reference_samples = augment(
+            samples=samples.astype(np.float32), sample_rate=16000
+        )
+
+        assert processed_samples.dtype == np.float16
+        assert reference_samples.dtype == np.float32
+        np.testing.assert_allclose(
+            processed_samples.astype(np.float32),
+            reference_samples,
+            rtol=1e-3,
+            atol=1e-6,
+        )
+
+    def test_non_contiguous_multichannel_input(self):
+        np.random.seed(5)
+        samples = (
+            np.random.uniform(low=-0.5, high=0.5, size=(200, 2)).astype(np.float32).T
+        )
+        assert not samples.flags.c_contiguous
+        augment = GainTransition(p=1.0)
+        augment.parameters = {
+            "should_apply": True,
+            "fade_time_samples": 120,
+            "t0": 30,
+            "start_gain_db": -12.0,
+            "end_gain_db": 6.0,
+        }
+        augment.freeze_parameters()
+        processed_samples = augment(samples=samples, sample_rate=16000)
+        expected_samples = augment(
+            samples=np.ascontiguousarray(samples), sample_rate=16000
+        )
+
+        assert processed_samples.flags.c_contiguous
+        assert processed_samples.dtype == np.float32
+        np.testing.assert_array_equal(processed_samples, expected_samples)
+
+    def test_zero_gain(self):
+        samples = np.random.uniform(low=-0.5, high=0.5, size=(2, 1000)).astype(
+            np.float32
+        )
+        augment = GainTransition(min_gain_db=0.0, max_gain_db=0.0, p=1.0)
+        processed_samples = augment(samples=samples, sample_rate=16000)
+        np.testing.assert_array_equal(processed_samples, samples)
+        assert processed_samples.dtype == np.float32
+
+    def test_constant_gain(self):
+        samples = np.random.uniform(low=-0.5, high=0.5, size=(1000,)).astype(np.float32)
+        augment = GainTransition(min_gain_db=-6.0, max_gain_db=-6.0, p=1.0)
+        processed_samples = augment(samples=samples, sample_rate=16000)
+        np.testing.assert_allclose(
+            processed_samples, samples * 10 ** (-6.0 / 20), rtol=1e-6
+        )
+        assert processed_samples.dtype == np.float32
+
+    def test_frozen_parameters(self):
+        np.random.seed(123)
+        random.seed(123)
+        samples = np.random.uniform(low=-0.5, high=0.5, size=(2, 3000)).astype(
+            np.float32
+        )
+        sample_rate = 16000
+
+        augment = GainTransition(
+            min_duration=100, max_duration=2000, duration_unit="samples", p=1.0
+        )
+        processed_samples1 = augment(samples=samples, sample_rate=sample_rate)
+        augment.freeze_parameters()
+        processed_samples2 = augment(samples=samples, sample_rate=sample_rate)
+        processed_samples3 = augment(samples=samples, sample_rate=sample_rate)
+
+        np.testing.assert_array_equal(processed_samples1, processed_samples2)
+        np.testing.assert_array_equal(processed_samples2, processed_samples3)
+        assert processed_samples3.flags.writeable
+
+    def test_picklability(self):
+        augment = GainTransition(
+            min_duration=0.1, max_duration=0.5, duration_unit="seconds", p=1.0
+        )
+        np.random.seed(3)
+        random.seed(3)
+        # Fill the fade mask cache, which should not be pickled
+        augment(samples=np.ones(8000, dtype=np.float32), sample_rate=16000)
+        assert augment._cached_fade_mask is not None
+        pickled = pickle.dumps(augment)
+        unpickled = pickle.loads(pickled)
+        assert unpickled._cached_fade_mask is None
+        assert unpickled.min_duration == augment.min_duration
+        assert unpickled.max_duration == augment.max_duration
+        assert unpickled.duration_unit == augment.duration_unit
+
+    def test_float_durations_in_samples(self):
+        np.random.seed(1)
+        samples = np.random.uniform(low=-0.5, high=0.5, size=(2, 300)).astype(
+            np.float32
+        )
+        augment = GainTransition(
+            min_duration=100.0, max_duration=200.0, duration_unit="samples", p=1.0
+        )
+        processed_samples = augment(samples=samples, sample_rate=16000)
+        assert isinstance(augment.parameters["fade_time_samples"], int)
+        assert isinstance(augment.parameters["t0"], int)
+        assert 100 <= augment.parameters["fade_time_samples"] <= 200
+        assert processed_samples.shape == samples.shape
+        assert processed_samples.dtype == np.float32
+
     def test_invalid_params(self):
         with pytest.raises(AssertionError):
             GainTransition(
                 min_duration=-12, max_duration=324, duration_unit="samples", p=1.0
             )
 
-        augment = GainTransition(
-            min_duration=45, max_duration=45, duration_unit="lightyears", p=1.0
-        )
         with pytest.raises(ValueError):
-            augment(np.zeros(40, dtype=np.float32), 16000)
+            GainTransition(
+                min_duration=45, max_duration=45, duration_unit="lightyears", p=1.0
+            )
@@ -1,33 +1,36 @@
 import numpy as np
+import pytest
 from numpy.testing import assert_array_almost_equal
 
 from audiomentations import Reverse
 
 
 class TestReverse:
-    def test_single_channel(self):
-        samples = np.array([0.5, 0.6, -0.2, 0.0], dtype=np.float32)
-        sample_rate = 16000
-        augmenter = Reverse(p=1.0)
-        samples = augmenter(samples=samples, sample_rate=sample_rate)
-
-        assert samples.dtype == np.float32
-        assert samples.shape[-1] == 4
-
-    def test_multichannel(self):
-        samples = np.array(
-            [[0.9, 0.5, -0.25, -0.125, 0.0], [0.95, 0.5, -0.25, -0.125, 0.0]],
-            dtype=np.float32,
-        )
+    @pytest.mark.parametrize(
+        "samples, expected_samples",
+        [
+            # Test both mono and multichannel
+            (
+                np.array([0.5, 0.6, -0.2, 0.0], dtype=np.float32),
+                np.array([0.0, -0.2, 0.6, 0.5], dtype=np.float32),
+            ),
+            (
+                np.array(
+                    [[0.9, 0.5, -0.25, -0.125, 0.0], [0.95, 0.5, -0.25, -0.125, 0.0]],
+                    dtype=np.float32,
+                ),
+                np.array(
+                    [[0.0, -0.125, -0.25, 0.5, 0.9], [0.0, -0.125, -0.25, 0.5, 0.95]],
+                    dtype=np.float32,
+                ),
+            ),
+        ],
+    )
+    def test_reverse(self, samples, expected_samples):
         sample_rate = 16000
         augmenter = Reverse(p=1.0)
         reversed_samples = augmenter(samples=samples, sample_rate=sample_rate)
 
-        assert samples.dtype == np.float32
-        assert_array_almost_equal(
-            reversed_samples,
-            np.array(
-                [[0.0, -0.125, -0.25, 0.5, 0.9], [0.0, -0.125, -0.25, 0.5, 0.95]],
-                dtype=np.float32,
-            ),
-        )
+        assert reversed_samples.dtype == np.float32
+        assert reversed_samples.shape == samples.shape
+        assert_array_almost_equal(reversed_samples, expected_samples)